@@ -1,12 +1,26 @@
 import pandas as pd
 import numpy as np
 import random
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from faker import Faker
 import json
+import orjson
+import pyarrow as pa
+import pyarrow.csv as pv
 
 fake = Faker()
 
+# Operator names are drawn from a small pre-generated pool; Faker is slow per call
+NAME_POOL_SIZE = 256
+
+def _make_name_pool(seed_sequence):
+    """Build the operator name pool from a Faker instance seeded by seed_sequence"""
+    pool_fake = Faker()
+    pool_fake.seed_instance(int(seed_sequence.generate_state(1)[0]))
+    return np.array([pool_fake.name() for _ in range(NAME_POOL_SIZE)], dtype=object)
+
 # Equipment types and their common issues
 EQUIPMENT_TYPES = {
     'pump': ['bearing_wear', 'seal_leak', 'cavitation', 'vibration', 'temperature_spike'],
@@ -16,6 +30,36 @@ EQUIPMENT_TYPES = {
     'heat_exchanger': ['fouling', 'corrosion', 'thermal_stress', 'flow_restriction']
 }
 
+# Message templates for WARNING/ERROR entries; other issues use the generic template
+ISSUE_TEMPLATES = {
+    'bearing_wear': "{equipment_id}: Vibration levels elevated to {vib}Hz, potential bearing wear detected",
+    'temperature_spike': "{equipment_id}: Temperature reading {temp}°C exceeds normal range (40-60°C)",
+    'seal_leak': "{equipment_id}: Pressure drop detected, possible seal integrity compromise",
+    'oil_leak': "{equipment_id}: Oil level decreased by {oil_loss}L in last 24h cycle",
+    'pressure_drop': "{equipment_id}: System pressure dropped to {pressure} PSI, investigating cause"
+}
+GENERIC_ISSUE_TEMPLATE = "{equipment_id}: {issue_title} detected during routine check"
+
+# Normal operational messages (appended to "<equipment_id>: ")
+NORMAL_MESSAGES = [
+    "Routine maintenance completed successfully",
+    "Operating within normal parameters",
+    "Scheduled inspection - no issues found",
+    "Performance metrics nominal"
+]
+
+FACILITIES = ['Plant_A', 'Plant_B', 'Plant_C']
+
+# Datasets at least this large are generated across all cores by default
+PARALLEL_MIN_ENTRIES = 200_000
+
+# Rows per independently seeded chunk; fixed so a seed gives the same data for any n_jobs
+CHUNK_ENTRIES = 50_000
+
+# Equipment IDs and types as parallel arrays (5 of each type)
+_EQ_IDS = np.array([f"{eq_type}_{i:02d}" for eq_type in EQUIPMENT_TYPES for i in range(1, 6)], dtype=object)
+_EQ_TYPES = np.array([eq_type for eq_type in EQUIPMENT_TYPES for _ in range(1, 6)], dtype=object)
+
 def generate_log_entry(equipment_id, equipment_type, timestamp, severity='INFO'):
     """Generate realistic industrial log entry"""
     
@@ -24,17 +68,11 @@ def generate_log_entry(equipment_id, equipment_type, timestamp, severity='INFO')
     if severity == 'WARNING' or severity == 'ERROR':
         issue = random.choice(issues)
         
-        templates = {
-            'bearing_wear': f"{equipment_id}: Vibration levels elevated to {{vib}}Hz, potential bearing wear detected",
-            'temperature_spike': f"{equipment_id}: Temperature reading {{temp}}°C exceeds normal range (40-60°C)",
-            'seal_leak': f"{equipment_id}: Pressure drop detected, possible seal integrity compromise",
-            'oil_leak': f"{equipment_id}: Oil level decreased by {{oil_loss}}L in last 24h cycle",
-            'pressure_drop': f"{equipment_id}: System pressure dropped to {{pressure}} PSI, investigating cause"
-        }
-        
         # Add realistic values
-        message = templates.get(issue, f"{equipment_id}: {issue.replace('_', ' ').title()} detected during routine check")
-        message = message.format(
+        template = ISSUE_TEMPLATES.get(issue, GENERIC_ISSUE_TEMPLATE)
+        message = template.format(
+            equipment_id=equipment_id,
+            issue_title=issue.replace('_', ' ').title(),
             vib=round(random.uniform(8.5, 12.0), 1),
             temp=round(random.uniform(75, 95), 1),
             oil_loss=round(random.uniform(0.5, 2.0), 1),
@@ -42,13 +80,7 @@ def generate_log_entry(equipment_id, equipment_type, timestamp, severity='INFO')
         )
     else:
         # Normal operational messages
-        normal_messages = [
-            f"{equipment_id}: Routine maintenance completed successfully",
-            f"{equipment_id}: Operating within normal parameters",
-            f"{equipment_id}: Scheduled inspection - no issues found",
-            f"{equipment_id}: Performance metrics nominal"
-        ]
-        message = random.choice(normal_messages)
+        message = f"{equipment_id}: {random.choice(NORMAL_MESSAGES)}"
     
     return {
         'timestamp': timestamp.isoformat(),
@@ -56,44 +88,103 @@ def generate_log_entry(equipment_id, equipment_type, timestamp, severity='INFO')
         'equipment_type': equipment_type,
         'severity': severity,
         'message': message,
-        'facility': random.choice(['Plant_A', 'Plant_B', 'Plant_C']),
+        'facility': random.choice(FACILITIES),
         'operator': fake.name()
     }
 
-def generate_dataset(num_entries=1000):
-    """Generate complete dataset"""
+def _generate_chunk(num_entries, start_date, seed, name_pool):
+    """Generate an unsorted block of log entries from its own random stream"""
+    
+    rng = np.random.default_rng(seed)
+    
+    # Random timestamp within 30 days of start_date
+    random_hours = rng.integers(0, 30*24, size=num_entries, endpoint=True)
+    timestamps = np.datetime_as_string(start_date + random_hours.astype('timedelta64[h]'), unit='us')
+    
+    # Select random equipment
+    eq_idx = rng.integers(0, len(_EQ_IDS), size=num_entries)
+    equipment_ids = _EQ_IDS[eq_idx]
+    equipment_types = _EQ_TYPES[eq_idx]
+    
+    # Determine severity (80% INFO, 15% WARNING, 5% ERROR)
+    severities = rng.choice(np.array(['INFO', 'WARNING', 'ERROR'], dtype=object), size=num_entries, p=[0.8, 0.15, 0.05])
     
-    logs = []
+    # Normal operational messages
+    normal_messages = np.array([f": {msg}" for msg in NORMAL_MESSAGES], dtype=object)
+    messages = equipment_ids + normal_messages[rng.integers(0, len(NORMAL_MESSAGES), size=num_entries)]
     
-    # Generate equipment IDs
-    equipment_list = []
-    for eq_type in EQUIPMENT_TYPES.keys():
-        for i in range(1, 6):  # 5 of each type
-            equipment_list.append((f"{eq_type}_{i:02d}", eq_type))
+    # Issue messages, formatted only for the WARNING/ERROR rows
+    abnormal = np.flatnonzero(severities != 'INFO')
+    n_abnormal = len(abnormal)
+    issue_draws = rng.random(n_abnormal)
+    vib = np.round(rng.uniform(8.5, 12.0, n_abnormal), 1).tolist()
+    temp = np.round(rng.uniform(75, 95, n_abnormal), 1).tolist()
+    oil_loss = np.round(rng.uniform(0.5, 2.0, n_abnormal), 1).tolist()
+    pressure = np.round(rng.uniform(15, 25, n_abnormal), 1).tolist()
+    
+    issue_messages = []
+    for j, row in enumerate(abnormal):
+        issues = EQUIPMENT_TYPES[equipment_types[row]]
+        issue = issues[int(issue_draws[j] * len(issues))]
+        issue_messages.append(ISSUE_TEMPLATES.get(issue, GENERIC_ISSUE_TEMPLATE).format(
+            equipment_id=equipment_ids[row],
+            issue_title=issue.replace('_', ' ').title(),
+            vib=vib[j],
+            temp=temp[j],
+            oil_loss=oil_loss[j],
+            pressure=pressure[j]
+        ))
+    messages[abnormal] = issue_messages
+    
+    df = pd.DataFrame({
+        'timestamp': timestamps,
+        'equipment_id': equipment_ids,
+        'equipment_type': equipment_types,
+        'severity': severities,
+        'message': messages,
+        'facility': rng.choice(np.array(FACILITIES, dtype=object), size=num_entries),
+        'operator': name_pool[rng.integers(0, len(name_pool), size=num_entries)]
+    })
+    
+    return df
+
+def generate_dataset(num_entries=1000, n_jobs=None, seed=None):
+    """Generate complete dataset, split across worker processes when large"""
     
     # Generate logs over 30 days
-    start_date = datetime.now() - timedelta(days=30)
+    start_date = np.datetime64(datetime.now() - timedelta(days=30), 'us')
     
-    for i in range(num_entries):
-        # Random timestamp within 30 days
-        random_hours = random.randint(0, 30*24)
-        timestamp = start_date + timedelta(hours=random_hours)
-        
-        # Select random equipment
-        equipment_id, equipment_type = random.choice(equipment_list)
-        
-        # Determine severity (80% INFO, 15% WARNING, 5% ERROR)
-        severity = np.random.choice(['INFO', 'WARNING', 'ERROR'], p=[0.8, 0.15, 0.05])
-        
-        log_entry = generate_log_entry(equipment_id, equipment_type, timestamp, severity)
-        logs.append(log_entry)
+    if n_jobs is None:
+        n_jobs = (os.cpu_count() or 1) if num_entries >= PARALLEL_MIN_ENTRIES else 1
+    
+    # Fixed-size chunks, each with its own random stream; n_jobs only sets the worker count
+    sizes = [min(CHUNK_ENTRIES, num_entries - start) for start in range(0, num_entries, CHUNK_ENTRIES)] or [0]
+    pool_seed, *seeds = np.random.SeedSequence(seed).spawn(len(sizes) + 1)
+    
+    # One pool for the whole run, so every chunk draws from the same names
+    name_pool = _make_name_pool(pool_seed)
+    
+    args = (sizes, [start_date] * len(sizes), seeds, [name_pool] * len(sizes))
+    n_jobs = max(1, min(n_jobs, len(sizes)))
+    if n_jobs == 1:
+        chunks = list(map(_generate_chunk, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            chunks = list(executor.map(_generate_chunk, *args))
+    df = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+    
+    return df.sort_values('timestamp')
+
+def save_dataset(df, csv_path='industrial_logs.csv', jsonl_path='industrial_logs.jsonl'):
+    """Write the dataset as CSV and JSON Lines"""
+    pv.write_csv(pa.Table.from_pandas(df, preserve_index=False), csv_path)
     
-    return pd.DataFrame(logs).sort_values('timestamp')
+    with open(jsonl_path, 'wb') as f:
+        f.write(b'\n'.join(orjson.dumps(record) for record in df.to_dict('records')) + b'\n')
 
 # Generate and save data
 if __name__ == "__main__":
     df = generate_dataset(4000)
-    df.to_csv('industrial_logs.csv', index=False)
-    df.to_json('industrial_logs.jsonl', orient='records', lines=True)
+    save_dataset(df)
     print(f"Generated {len(df)} log entries")
     print(df.head())
\ No newline at end of file
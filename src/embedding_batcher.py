@@ -0,0 +1,74 @@
+import asyncio
+import numpy as np
+from typing import Callable, List, Optional
+
+
+class EmbeddingBatcher:
+    """Collects concurrent queries and embeds them with a single encode call"""
+    
+    def __init__(self, encode_fn: Callable[[List[str]], np.ndarray],
+                 max_batch_size: int = 16, max_wait: float = 0.005):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the background batching task on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Cancel the background task and fail any queries still waiting"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding batcher stopped"))
+    
+    async def submit(self, query: str) -> np.ndarray:
+        """Queue a query and wait for its embedding"""
+        if self._task is None:
+            raise RuntimeError("Embedding batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, future))
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            
+            try:
+                # Give concurrent requests a moment to join unless the batch is already full
+                if self._queue.qsize() < self.max_batch_size - 1:
+                    await asyncio.sleep(self.max_wait)
+                while len(batch) < self.max_batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                
+                queries = [query for query, _ in batch]
+                embeddings = await loop.run_in_executor(None, self.encode_fn, queries)
+            except asyncio.CancelledError:
+                # Stopped mid-batch: release the callers instead of leaving them waiting
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Embedding batcher stopped"))
+                raise
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
@@ -1,11 +1,20 @@
+import os
+
+# Keep BLAS/OpenMP pools at one thread; concurrent API requests otherwise oversubscribe
+# the cores. Must be set before numpy/torch are imported (via rag_system).
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 import uvicorn
 from rag_system import IndustrialRAGSystem
-import os
+from embedding_batcher import EmbeddingBatcher
+import asyncio
 import logging
-import pandas as pd
+from datetime import datetime, timezone
 
 
 # Configure logging
@@ -34,17 +43,26 @@ class InsightResponse(BaseModel):
     relevant_logs: List[Dict]
     timestamp: str
 
+# Cap on queries embedding/searching at the same time; at least one, since
+# Semaphore(0) would block every query forever
+MAX_CONCURRENT_QUERIES = max(1, min(os.cpu_count() or 1, int(os.getenv("MAX_WORKERS", os.cpu_count() or 1))))
+
 # Global RAG system instance
 rag_system = None
+query_semaphore = None
+embedding_batcher = None
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize RAG system on startup"""
-    global rag_system
+    global rag_system, query_semaphore, embedding_batcher
     logger.info("Initializing RAG system...")
+    query_semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
     
     try:
         rag_system = IndustrialRAGSystem()
+        embedding_batcher = EmbeddingBatcher(rag_system.embed_queries)
+        embedding_batcher.start()
         
         # Load data (check multiple possible locations)
         data_paths = [r'C:\Users\USER\Desktop\DATA SCIENCE\Industrial_llm\data\industrial_logs.csv', 
@@ -68,6 +86,22 @@ async def startup_event():
         logger.error(f"Failed to initialize RAG system: {str(e)}")
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the embedding batcher"""
+    if embedding_batcher:
+        await embedding_batcher.stop()
+
+async def run_query(query: str) -> Dict:
+    """Answer a query, batching its embedding with concurrent requests"""
+    result = rag_system.get_cached_response(query)
+    if result is not None:
+        return result
+    
+    query_embedding = await embedding_batcher.submit(query)
+    async with query_semaphore:
+        return await run_in_threadpool(rag_system.query_with_embedding, query, query_embedding)
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -83,7 +117,7 @@ async def health_check():
     return {
         "status": "healthy",
         "rag_system_initialized": rag_system is not None,
-        "timestamp": pd.Timestamp.now().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 @app.post("/query", response_model=InsightResponse)
@@ -93,7 +127,7 @@ async def query_logs(request: QueryRequest):
         raise HTTPException(status_code=503, detail="RAG system not initialized")
     
     try:
-        result = rag_system.query_system(request.query)
+        result = await run_query(request.query)
         return InsightResponse(**result)
     
     except Exception as e:
@@ -110,7 +144,7 @@ async def analyze_anomaly(request: AnomalyRequest):
     query = f"{request.equipment_id} {request.anomaly_type} {request.severity}"
     
     try:
-        result = rag_system.query_system(query)
+        result = await run_query(query)
         result['query'] = f"Anomaly analysis for {request.equipment_id}: {request.anomaly_type}"
         return InsightResponse(**result)
     
@@ -0,0 +1,98 @@
+import re
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Query cache settings
+CACHE_MAX_ENTRIES = 1024
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# Parts of a query a semantic hit must agree on exactly; near-identical
+# queries about pump_01 and pump_02 must not share an answer
+_EQUIPMENT_ID_RE = re.compile(r'\b\w+_\d{2}\b')
+_SEVERITY_RE = re.compile(r'\b(INFO|WARNING|ERROR)\b', re.IGNORECASE)
+
+
+def query_scope(query: str) -> Tuple[frozenset, frozenset]:
+    """Equipment IDs and severities mentioned in a query"""
+    return (
+        frozenset(match.lower() for match in _EQUIPMENT_ID_RE.findall(query)),
+        frozenset(match.upper() for match in _SEVERITY_RE.findall(query))
+    )
+
+
+class QueryCache:
+    """Two-tier response cache: exact query string, then embedding similarity.
+
+    Both tiers share one LRU order. Each cached query owns a fixed row of the
+    embedding matrix; evicting the least recently used query frees its row.
+    """
+
+    def __init__(self, embedding_dim: int, max_entries: int = CACHE_MAX_ENTRIES,
+                 threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        # query -> row, least recently used first
+        self._order: OrderedDict = OrderedDict()
+        self._vecs = np.zeros((max_entries, embedding_dim), dtype=np.float32)
+        self._queries: List[Optional[str]] = [None] * max_entries
+        self._scopes: List[Optional[Tuple[frozenset, frozenset]]] = [None] * max_entries
+        self._entries: List[Optional[Dict]] = [None] * max_entries
+        self._used = 0
+
+    def clear(self):
+        """Drop all cached responses"""
+        with self._lock:
+            self._order.clear()
+            self._queries = [None] * self.max_entries
+            self._scopes = [None] * self.max_entries
+            self._entries = [None] * self.max_entries
+            self._used = 0
+
+    def get_exact(self, query: str) -> Optional[Dict]:
+        """Return the response cached for exactly this query string"""
+        with self._lock:
+            row = self._order.get(query)
+            if row is None:
+                return None
+            self._order.move_to_end(query)
+            return self._entries[row]
+
+    def get_similar(self, query: str, query_embedding: np.ndarray) -> Optional[Dict]:
+        """Return the response for the most similar earlier query about the same equipment and severity"""
+        scope = query_scope(query)
+        with self._lock:
+            if not self._used:
+                return None
+
+            # Vectors are L2-normalized, so the dot product is the cosine similarity
+            sims = self._vecs[:self._used] @ query_embedding
+            sims[[cached_scope != scope for cached_scope in self._scopes[:self._used]]] = -np.inf
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+
+            self._order.move_to_end(self._queries[best])
+            return self._entries[best]
+
+    def store(self, query: str, query_embedding: np.ndarray, response: Dict):
+        """Remember a response under both the exact query and its embedding"""
+        with self._lock:
+            # Concurrent misses for the same query keep the first answer
+            if query in self._order:
+                self._order.move_to_end(query)
+                return
+
+            if self._used < self.max_entries:
+                row = self._used
+                self._used += 1
+            else:
+                _, row = self._order.popitem(last=False)
+
+            self._order[query] = row
+            self._vecs[row] = query_embedding
+            self._queries[row] = query
+            self._scopes[row] = query_scope(query)
+            self._entries[row] = response
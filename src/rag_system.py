@@ -1,79 +1,257 @@
-import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
 from sentence_transformers import SentenceTransformer
 import chromadb
-from transformers import pipeline
 import torch
-from typing import List, Dict
+from query_cache import QueryCache
+from typing import List, Dict, Optional
+import hashlib
 import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+
+# Vector database settings
+COLLECTION_NAME = "industrial_logs"
+# Smaller HNSW graph than Chroma's defaults (M=16, construction_ef=100): faster builds,
+# and recall stays high for a few thousand to ~100k log entries
+COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:construction_ef": 64,
+    "hnsw:M": 8,
+    "hnsw:search_ef": 32,
+    "hnsw:num_threads": os.cpu_count() or 1
+}
+
+# Fields combined into the text that gets embedded
+SEARCHABLE_COLUMNS = ['equipment_id', 'equipment_type', 'severity', 'message']
+
+# Fields stored as Chroma metadata and returned with each hit; operator and
+# equipment_type are left out (equipment_type is already in the embedded text)
+METADATA_COLUMNS = ['timestamp', 'equipment_id', 'severity', 'message', 'facility']
+
+# Rule-based analyses, in priority order, keyed by the keyword that triggers them
+KEYWORD_ANALYSES = {
+    'temperature': "Temperature anomaly detected. Recommend immediate inspection of cooling systems and thermal sensors.",
+    'vibration': "Vibration patterns suggest mechanical wear. Schedule bearing inspection and lubrication check.",
+    'pressure': "Pressure variations detected. Check for leaks, blockages, or pump performance issues."
+}
+DEFAULT_ANALYSIS = "Multiple equipment events detected. Recommend comprehensive system review."
+_KEYWORD_RE = re.compile('|'.join(KEYWORD_ANALYSES), re.IGNORECASE)
+
+# Optional generative model, only loaded when use_llm=True
+LLM_MODEL_NAME = "microsoft/DialoGPT-medium"
+
+# Embedding settings
+ENCODE_BATCH_SIZE = 64
 
 class IndustrialRAGSystem:
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
+    def __init__(self, model_name="all-MiniLM-L6-v2", embedding_cache_path=".embedding_cache.npz",
+                 persist_directory=None, num_threads=1, use_llm=False):
         """Initialize RAG system with embedding model and LLM"""
+        # Per-request encodes stay on num_threads; bulk indexing temporarily uses every core
+        self.num_threads = num_threads
+        torch.set_num_threads(num_threads)
+        
         print("Loading embedding model...")
-        self.embedding_model = SentenceTransformer(model_name)
+        self.model_name = model_name
+        self.embedding_cache_path = embedding_cache_path
+        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.embedding_model = SentenceTransformer(model_name, device=self.device)
+        if self.device == 'cuda':
+            # fp16 inference on GPU
+            self.embedding_model.half()
+        self.embedding_dim = self.embedding_model.get_sentence_embedding_dimension()
         
         print("Initializing vector database...")
-        self.chroma_client = chromadb.Client()
-        self.collection = self.chroma_client.create_collection(
-            name="industrial_logs",
-            metadata={"hnsw:space": "cosine"}
-        )
+        persist_directory = persist_directory or os.getenv("CHROMA_PERSIST_DIRECTORY", "./chroma_db")
+        self.chroma_client = chromadb.PersistentClient(path=persist_directory)
+        try:
+            # Open the persisted collection as-is; get_or_create_collection would overwrite
+            # its metadata (HNSW settings and the stored data_hash) with the defaults
+            self.collection = self.chroma_client.get_collection(name=COLLECTION_NAME)
+        except Exception:  # the "not found" error type differs between chromadb versions
+            self.collection = self.chroma_client.create_collection(
+                name=COLLECTION_NAME,
+                metadata=COLLECTION_METADATA
+            )
         
-        print("Loading LLM for generation...")
-        # Use a lightweight model for local testing
-        self.llm = pipeline(
-            "text-generation",
-            model="microsoft/DialoGPT-medium",
-            torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32,
-            device=0 if torch.cuda.is_available() else -1
-        )
+        # The LLM is loaded on first use, and only when generation is enabled
+        self._use_llm = use_llm
+        self._llm_lock = threading.Lock()
+        self.llm = None
+        
+        # Two-tier query cache: exact query string, then embedding similarity
+        self._query_cache = QueryCache(self.embedding_dim)
         
     def load_and_index_logs(self, csv_path: str):
         """Load logs and create embeddings"""
+        # Skip re-indexing when the persisted collection was built from the same file
+        data_hash = self._index_fingerprint(csv_path)
+        stored_hash = (self.collection.metadata or {}).get("data_hash")
+        if self.collection.count() > 0 and stored_hash == data_hash:
+            print(f"Index for {csv_path} is up to date ({self.collection.count()} entries)")
+            return
+        
         print(f"Loading logs from {csv_path}...")
-        df = pd.read_csv(csv_path)
+        # Multithreaded Arrow CSV reader; timestamps stay ISO strings since Chroma metadata must be scalars
+        table = pv.read_csv(
+            csv_path,
+            convert_options=pv.ConvertOptions(column_types={'timestamp': pa.string()})
+        )
         
         # Create searchable text combining relevant fields
-        df['searchable_text'] = df.apply(
-            lambda row: f"{row['equipment_id']} {row['equipment_type']} {row['severity']} {row['message']}", 
-            axis=1
-        )
+        searchable_text = pc.binary_join_element_wise(
+            *[pc.cast(table[col], pa.string()) for col in SEARCHABLE_COLUMNS],
+            ' ',
+            null_handling='replace'
+        ).to_pylist()
         
         print("Creating embeddings...")
-        embeddings = self.embedding_model.encode(df['searchable_text'].tolist())
+        torch.set_num_threads(os.cpu_count() or 1)
+        try:
+            embeddings = self._encode_texts(searchable_text)
+        finally:
+            torch.set_num_threads(self.num_threads)
         
         print("Storing in vector database...")
+        # Replace any stale index rather than mixing old and new entries
+        self.chroma_client.delete_collection(COLLECTION_NAME)
+        self.collection = self.chroma_client.create_collection(
+            name=COLLECTION_NAME,
+            metadata=COLLECTION_METADATA
+        )
         self.collection.add(
-            embeddings=embeddings.tolist(),
-            documents=df['searchable_text'].tolist(),
-            metadatas=df.to_dict('records'),
-            ids=[str(i) for i in range(len(df))]
+            embeddings=embeddings,
+            documents=searchable_text,
+            metadatas=table.select(METADATA_COLUMNS).to_pylist(),
+            ids=[str(i) for i in range(table.num_rows)]
         )
         
-        print(f"Indexed {len(df)} log entries")
+        # Record the source only after every entry is stored, so an interrupted build is never
+        # reused. modify() rejects "hnsw:space"; the distance function is fixed at creation anyway
+        self.collection.modify(metadata={
+            **{key: value for key, value in COLLECTION_METADATA.items() if key != "hnsw:space"},
+            "data_hash": data_hash
+        })
         
-    def retrieve_relevant_logs(self, query: str, top_k: int = 5) -> List[Dict]:
-        """Retrieve most relevant logs for a query"""
-        query_embedding = self.embedding_model.encode([query])
+        print(f"Indexed {table.num_rows} log entries")
         
-        results = self.collection.query(
-            query_embeddings=query_embedding.tolist(),
-            n_results=top_k
+        # Cached answers refer to the previous index
+        self.clear_cache()
+        
+    def _index_fingerprint(self, path: str) -> str:
+        """SHA-1 of a file's contents plus the settings that shape the index built from it"""
+        # hnsw:num_threads only affects build speed and varies by machine, so it is left out
+        hnsw_settings = sorted(
+            (key, value) for key, value in COLLECTION_METADATA.items() if key != "hnsw:num_threads"
+        )
+        sha1 = hashlib.sha1(
+            f"{self.model_name}|{','.join(SEARCHABLE_COLUMNS)}|{','.join(METADATA_COLUMNS)}|"
+            f"{hnsw_settings}|".encode('utf-8')
         )
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(block)
+        return sha1.hexdigest()
+    
+    def _load_embedding_cache(self) -> Dict[str, np.ndarray]:
+        """Load previously computed embeddings keyed by text hash (best-effort)"""
+        if not self.embedding_cache_path or not os.path.exists(self.embedding_cache_path):
+            return {}
         
-        return results['metadatas'][0] if results['metadatas'] else []
+        try:
+            with np.load(self.embedding_cache_path) as cache:
+                if str(cache['model_name']) != self.model_name:
+                    return {}
+                return dict(zip(cache['keys'].tolist(), cache['vectors']))
+        except Exception as e:  # truncated/corrupt file or an older layout: just re-embed
+            print(f"Ignoring unreadable embedding cache {self.embedding_cache_path}: {e}")
+            return {}
+    
+    def _save_embedding_cache(self, cache: Dict[str, np.ndarray]):
+        """Write the text-hash -> embedding cache to disk (best-effort)"""
+        if not self.embedding_cache_path or not cache:
+            return
+        
+        # Write to a temp file and swap it in, so a crash never leaves a truncated cache
+        tmp_path = f"{self.embedding_cache_path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    model_name=np.array(self.model_name),
+                    keys=np.array(list(cache.keys())),
+                    vectors=np.stack(list(cache.values())).astype(np.float32)
+                )
+            os.replace(tmp_path, self.embedding_cache_path)
+        except OSError as e:
+            print(f"Could not write embedding cache {self.embedding_cache_path}: {e}")
+    
+    def _encode(self, texts: List[str], batch_size: int = ENCODE_BATCH_SIZE) -> np.ndarray:
+        """Embed texts on the model's device as L2-normalized float32 vectors"""
+        if not texts:
+            return np.empty((0, self.embedding_dim), dtype=np.float32)
+        
+        # encode() sorts inputs by length internally, so batches carry little padding
+        embeddings = self.embedding_model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        # Leave the device only at the Chroma boundary; fp16 output is widened to float32
+        return embeddings.float().cpu().numpy()
+    
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, encoding each distinct string once and reusing cached vectors"""
+        if not texts:
+            return np.empty((0, self.embedding_dim), dtype=np.float32)
+        
+        unique_texts, inverse = np.unique(np.array(texts, dtype=str), return_inverse=True)
+        unique_texts = unique_texts.tolist()
+        keys = [hashlib.sha1(text.encode('utf-8')).hexdigest() for text in unique_texts]
+        
+        cache = self._load_embedding_cache()
+        missing = [i for i, key in enumerate(keys) if key not in cache]
+        print(f"{len(unique_texts)} unique texts, {len(missing)} not in embedding cache")
+        
+        if missing:
+            new_embeddings = self._encode([unique_texts[i] for i in missing])
+            for i, embedding in zip(missing, new_embeddings):
+                cache[keys[i]] = embedding
+        
+        # Keep only the current texts' vectors, so stale entries are pruned on each re-index
+        current = {key: cache[key] for key in keys}
+        if missing or len(current) != len(cache):
+            self._save_embedding_cache(current)
+        
+        unique_embeddings = np.stack([current[key] for key in keys])
+        return unique_embeddings[inverse.reshape(-1)]
+    
+    def retrieve_by_embedding(self, query_embedding: np.ndarray, top_k: int = 5) -> List[Dict]:
+        """Retrieve most relevant logs for an already-computed query embedding"""
+        return self.retrieve_relevant_logs_batch(query_embedding[np.newaxis, :], top_k)[0]
+    
+    def retrieve_relevant_logs(self, query: str, top_k: int = 5) -> List[Dict]:
+        """Retrieve most relevant logs for a query"""
+        return self.retrieve_by_embedding(self.embed_queries([query])[0], top_k)
     
     def generate_insight(self, query: str, context_logs: List[Dict]) -> str:
         """Generate insight based on query and retrieved logs"""
         
-        # Format context
-        context = "\n".join([
-            f"- {log['timestamp']}: {log['message']}" 
-            for log in context_logs[:3]  # Use top 3 most relevant
-        ])
-        
-        prompt = f"""Based on the following industrial equipment logs, provide a concise analysis:
+        if self._use_llm:
+            # Format context
+            context = "\n".join([
+                f"- {log['timestamp']}: {log['message']}" 
+                for log in context_logs[:3]  # Use top 3 most relevant
+            ])
+            
+            prompt = f"""Based on the following industrial equipment logs, provide a concise analysis:
 
 Query: {query}
 
@@ -81,26 +259,69 @@ Relevant Log Entries:
 {context}
 
 Analysis:"""
+            output = self._get_llm()(prompt, max_new_tokens=100, return_full_text=False)
+            return output[0]['generated_text'].strip()
         
         # For demo purposes, create a simple rule-based response
-        # In production, you'd use a more sophisticated LLM
-        if any('temperature' in log['message'].lower() for log in context_logs):
-            analysis = "Temperature anomaly detected. Recommend immediate inspection of cooling systems and thermal sensors."
-        elif any('vibration' in log['message'].lower() for log in context_logs):
-            analysis = "Vibration patterns suggest mechanical wear. Schedule bearing inspection and lubrication check."
-        elif any('pressure' in log['message'].lower() for log in context_logs):
-            analysis = "Pressure variations detected. Check for leaks, blockages, or pump performance issues."
-        else:
-            analysis = "Multiple equipment events detected. Recommend comprehensive system review."
-            
-        return analysis
+        # One regex pass over all messages; the highest-priority keyword found wins
+        joined = "\n".join(log['message'] for log in context_logs)
+        found = {match.lower() for match in _KEYWORD_RE.findall(joined)}
+        for keyword, analysis in KEYWORD_ANALYSES.items():
+            if keyword in found:
+                return analysis
+        
+        return DEFAULT_ANALYSIS
     
-    def query_system(self, query: str) -> Dict:
-        """Main query interface"""
-        print(f"Processing query: {query}")
+    def _get_llm(self):
+        """Load the text-generation pipeline on first use"""
+        with self._llm_lock:
+            if self.llm is None:
+                from transformers import pipeline
+                
+                print("Loading LLM for generation...")
+                self.llm = pipeline(
+                    "text-generation",
+                    model=LLM_MODEL_NAME,
+                    torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32,
+                    device=0 if torch.cuda.is_available() else -1
+                )
+        return self.llm
+    
+    def clear_cache(self):
+        """Drop all cached query responses"""
+        self._query_cache.clear()
+    
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed a batch of queries as L2-normalized float32 vectors"""
+        return self._encode(queries, batch_size=max(len(queries), 1))
+    
+    def retrieve_relevant_logs_batch(self, query_embeddings: np.ndarray, top_k: int = 5) -> List[List[Dict]]:
+        """Retrieve the most relevant logs for several query embeddings in one search"""
+        results = self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=top_k
+        )
+        
+        if not results['metadatas']:
+            return [[] for _ in range(len(query_embeddings))]
+        return results['metadatas']
+    
+    def get_cached_response(self, query: str) -> Optional[Dict]:
+        """Return the cached response for an exact repeat of an earlier query"""
+        cached = self._query_cache.get_exact(query)
+        if cached is None:
+            return None
+        return {**cached, "timestamp": datetime.now(timezone.utc).isoformat()}
+    
+    def query_with_embedding(self, query: str, query_embedding: np.ndarray) -> Dict:
+        """Answer a query whose normalized embedding has already been computed"""
+        # Paraphrase of an earlier query about the same equipment
+        cached = self._query_cache.get_similar(query, query_embedding)
+        if cached is not None:
+            return {**cached, "query": query, "timestamp": datetime.now(timezone.utc).isoformat()}
         
         # Retrieve relevant logs
-        relevant_logs = self.retrieve_relevant_logs(query)
+        relevant_logs = self.retrieve_by_embedding(query_embedding)
         
         if not relevant_logs:
             return {
@@ -112,12 +333,28 @@ Analysis:"""
         # Generate insight
         insight = self.generate_insight(query, relevant_logs)
         
-        return {
+        response = {
             "query": query,
             "relevant_logs": relevant_logs,
             "insight": insight,
-            "timestamp": pd.Timestamp.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
+        self._query_cache.store(query, query_embedding, response)
+        
+        return dict(response)
+    
+    def query_system(self, query: str) -> Dict:
+        """Main query interface"""
+        print(f"Processing query: {query}")
+        
+        # Exact repeat of an earlier query
+        cached = self.get_cached_response(query)
+        if cached is not None:
+            return cached
+        
+        # Embed once; reused for the semantic cache and the vector search
+        query_embedding = self.embed_queries([query])[0]
+        return self.query_with_embedding(query, query_embedding)
 
 # Test the system
 if __name__ == "__main__":
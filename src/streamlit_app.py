@@ -54,8 +54,9 @@ st.markdown("""
 # Configuration
 API_BASE_URL = "http://127.0.0.1:8000"  # Your FastAPI server
 
+@st.cache_data(ttl=10, show_spinner=False)
 def check_api_health():
-    """Check if the API is running"""
+    """Check if the API is running (re-checked at most every 10 seconds)"""
     try:
         response = requests.get(f"{API_BASE_URL}/health", timeout=5)
         return response.status_code == 200
@@ -94,12 +95,24 @@ def analyze_anomaly(equipment_id: str, anomaly_type: str) -> Dict:
         st.error(f"API Error: {str(e)}")
         return None
 
+def logs_cache_key(logs: List[Dict]) -> tuple:
+    """Hashable identity of a result's logs, used to key cached charts"""
+    return tuple(
+        (log.get('timestamp'), log.get('equipment_id'), log.get('severity'), log.get('message'))
+        for log in logs
+    )
+
 def create_severity_chart(logs: List[Dict]):
     """Create a chart showing severity distribution"""
     if not logs:
         return None
-    
-    df = pd.DataFrame(logs)
+    return _build_severity_chart(logs_cache_key(logs), logs)
+
+# Arguments starting with "_" are not hashed by st.cache_data; the key identifies the logs
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_severity_chart(cache_key: tuple, _logs: List[Dict]):
+    """Build the severity pie chart (cached per set of logs)"""
+    df = pd.DataFrame(_logs)
     severity_counts = df['severity'].value_counts()
     
     fig = px.pie(
@@ -118,8 +131,12 @@ def create_timeline_chart(logs: List[Dict]):
     """Create a timeline of equipment events"""
     if not logs:
         return None
-    
-    df = pd.DataFrame(logs)
+    return _build_timeline_chart(logs_cache_key(logs), logs)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_timeline_chart(cache_key: tuple, _logs: List[Dict]):
+    """Build the events timeline (cached per set of logs)"""
+    df = pd.DataFrame(_logs)
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     df = df.sort_values('timestamp')
     
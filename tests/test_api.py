@@ -1,5 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
+from datetime import datetime
 from main import app
 
 client = TestClient(app)
@@ -12,6 +13,9 @@ def test_root_endpoint():
 def test_health_endpoint():
     response = client.get("/health")
     assert response.status_code == 200
+    # Timestamps are timezone-aware UTC
+    timestamp = datetime.fromisoformat(response.json()["timestamp"])
+    assert timestamp.utcoffset().total_seconds() == 0
 
 def test_query_endpoint():
     response = client.post(
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+import data_generator
+from data_generator import generate_dataset
+
+def assert_same_dataset(first, second):
+    """Equal apart from timestamps, which are relative to the current time"""
+    first = first.reset_index(drop=True)
+    second = second.reset_index(drop=True)
+    pd.testing.assert_frame_equal(first.drop(columns='timestamp'), second.drop(columns='timestamp'))
+    pd.testing.assert_series_equal(
+        pd.to_datetime(first['timestamp']).diff(),
+        pd.to_datetime(second['timestamp']).diff()
+    )
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_seeded_runs_are_reproducible(n_jobs):
+    first = generate_dataset(2000, n_jobs=n_jobs, seed=7)
+    second = generate_dataset(2000, n_jobs=n_jobs, seed=7)
+    assert len(first) == 2000
+    assert_same_dataset(first, second)
+
+def test_seeded_output_does_not_depend_on_n_jobs(monkeypatch):
+    # Small chunks so 2000 rows span several independently seeded chunks
+    monkeypatch.setattr(data_generator, "CHUNK_ENTRIES", 300)
+    serial = generate_dataset(2000, n_jobs=1, seed=7)
+    assert_same_dataset(serial, generate_dataset(2000, n_jobs=2, seed=7))
+    assert_same_dataset(serial, generate_dataset(2000, n_jobs=4, seed=7))
+
+def test_different_seeds_differ():
+    first = generate_dataset(500, seed=1)
+    second = generate_dataset(500, seed=2)
+    assert not first['operator'].reset_index(drop=True).equals(second['operator'].reset_index(drop=True))
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import numpy as np
+import pytest
+from embedding_batcher import EmbeddingBatcher
+
+def index_encoder(calls):
+    """Fake encode_fn: row i is [int(query_i)], and each batch size is recorded"""
+    def encode(queries):
+        calls.append(len(queries))
+        return np.array([[float(query)] for query in queries], dtype=np.float32)
+    return encode
+
+def test_concurrent_submits_are_batched_in_order():
+    calls = []
+
+    async def run():
+        batcher = EmbeddingBatcher(index_encoder(calls), max_batch_size=16)
+        batcher.start()
+        try:
+            return await asyncio.gather(*[batcher.submit(str(i)) for i in range(40)])
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+    assert calls == [16, 16, 8]
+    assert [float(row[0]) for row in results] == list(range(40))
+
+def test_encode_error_reaches_caller():
+    def failing_encode(queries):
+        raise ValueError("encoder failed")
+
+    async def run():
+        batcher = EmbeddingBatcher(failing_encode)
+        batcher.start()
+        try:
+            with pytest.raises(ValueError, match="encoder failed"):
+                await batcher.submit("pump_01")
+        finally:
+            await batcher.stop()
+
+    asyncio.run(run())
+
+def test_stop_fails_pending_queries():
+    release = threading.Event()
+
+    def blocking_encode(queries):
+        release.wait(5)
+        return np.zeros((len(queries), 1), dtype=np.float32)
+
+    async def run():
+        batcher = EmbeddingBatcher(blocking_encode, max_batch_size=2, max_wait=0)
+        batcher.start()
+        # The first batch is stuck in encode; the rest are still queued
+        pending = [asyncio.ensure_future(batcher.submit(str(i))) for i in range(5)]
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        release.set()
+        return await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), 1)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+def test_submit_requires_running_batcher():
+    async def run():
+        with pytest.raises(RuntimeError):
+            await EmbeddingBatcher(index_encoder([])).submit("pump_01")
+
+    asyncio.run(run())
@@ -0,0 +1,77 @@
+import re
+import zlib
+import numpy as np
+from query_cache import QueryCache
+
+DIM = 64
+
+def stub_encode(query):
+    """Bag-of-words embedding that ignores word order and digits, so
+    'pump_01' and 'pump_02' queries embed identically (worst case for the cache)"""
+    vec = np.zeros(DIM, dtype=np.float32)
+    for token in re.sub(r'\d', '', query.lower()).split():
+        vec[zlib.crc32(token.encode()) % DIM] += 1.0
+    return vec / np.linalg.norm(vec)
+
+def make_response(query):
+    return {"query": query, "relevant_logs": [{"message": query}], "insight": "ok", "timestamp": "t"}
+
+def test_exact_hit():
+    cache = QueryCache(DIM)
+    query = "pump_01 temperature alerts"
+    cache.store(query, stub_encode(query), make_response(query))
+    assert cache.get_exact(query)["query"] == query
+    assert cache.get_exact("pump_01 vibration alerts") is None
+
+def test_paraphrase_hits_semantic_cache():
+    cache = QueryCache(DIM)
+    query = "pump_01 temperature alerts"
+    cache.store(query, stub_encode(query), make_response(query))
+    paraphrase = "temperature alerts pump_01"
+    assert cache.get_similar(paraphrase, stub_encode(paraphrase))["query"] == query
+
+def test_different_equipment_id_misses_semantic_cache():
+    cache = QueryCache(DIM)
+    query = "pump_01 temperature_spike WARNING"
+    cache.store(query, stub_encode(query), make_response(query))
+    other = "pump_02 temperature_spike WARNING"
+    assert float(stub_encode(other) @ stub_encode(query)) > 0.95
+    assert cache.get_similar(other, stub_encode(other)) is None
+
+def test_different_severity_misses_semantic_cache():
+    cache = QueryCache(DIM)
+    query = "pump_01 temperature_spike WARNING"
+    cache.store(query, stub_encode(query), make_response(query))
+    other = "pump_01 temperature_spike ERROR"
+    assert cache.get_similar(other, stub_encode(other)) is None
+
+def test_cache_is_bounded_and_clearable():
+    cache = QueryCache(DIM, max_entries=2)
+    for query in ["pump_01 leak", "motor_01 heat", "turbine_01 wear"]:
+        cache.store(query, stub_encode(query), make_response(query))
+    assert cache.get_exact("pump_01 leak") is None
+    assert cache.get_similar("pump_01 leak", stub_encode("pump_01 leak")) is None
+    assert cache.get_exact("turbine_01 wear") is not None
+
+    cache.clear()
+    assert cache.get_exact("turbine_01 wear") is None
+    assert cache.get_similar("turbine_01 wear", stub_encode("turbine_01 wear")) is None
+
+def test_semantic_hit_refreshes_recency():
+    cache = QueryCache(DIM, max_entries=2)
+    for query in ["pump_01 leak", "motor_01 heat"]:
+        cache.store(query, stub_encode(query), make_response(query))
+    # Paraphrase hit makes pump_01 the most recently used entry
+    assert cache.get_similar("leak pump_01", stub_encode("leak pump_01"))["query"] == "pump_01 leak"
+    cache.store("turbine_01 wear", stub_encode("turbine_01 wear"), make_response("turbine_01 wear"))
+    assert cache.get_exact("motor_01 heat") is None
+    assert cache.get_similar("motor_01 heat", stub_encode("motor_01 heat")) is None
+    assert cache.get_exact("pump_01 leak") is not None
+
+def test_storing_a_cached_query_again_keeps_one_entry():
+    cache = QueryCache(DIM, max_entries=2)
+    cache.store("pump_01 leak", stub_encode("pump_01 leak"), make_response("first"))
+    cache.store("pump_01 leak", stub_encode("pump_01 leak"), make_response("second"))
+    cache.store("motor_01 heat", stub_encode("motor_01 heat"), make_response("motor_01 heat"))
+    assert cache.get_exact("pump_01 leak")["query"] == "first"
+    assert cache.get_exact("motor_01 heat") is not None